@@ -0,0 +1,651 @@
+"""
+Harmonic scan engine for Luminara: ephemeris geometry, coarse hit detection, refinement
+and the worker-process entry points. Kept free of Streamlit so worker processes can
+import it by name.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from skyfield.api import load
+from skyfield.framelib import ecliptic_J2000_frame
+
+# ============================================================================
+# DATETIME UTILITIES
+# ============================================================================
+
+MINUTES_PER_DAY = 1440
+
+def utc_timestamps(t):
+    """
+    UTC-aware pandas timestamps for a Skyfield Time array, assembled from its UTC
+    calendar fields in NumPy instead of one Python datetime per element.
+    """
+    year, month, day, hour, minute, second = t.utc
+    dates = (year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1).astype('timedelta64[M]')
+    dates = dates.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    seconds = np.round((hour * 3600.0 + minute * 60.0 + second) * 1e9).astype('timedelta64[ns]')
+    return pd.to_datetime(dates + seconds, utc=True)
+
+# ============================================================================
+# PLANETARY SETUP
+# ============================================================================
+
+# NAIF codes for the bodies offered in the UI (built once, not per lookup)
+_PLANET_CODES = {
+    'sun': 10, 'moon': 301, 'mercury': 1, 'venus': 2, 'mars': 4,
+    'jupiter': 5, 'saturn': 6, 'uranus': 7, 'neptune': 8, 'pluto': 9
+}
+
+# Display names for the planet selectors, derived from the code map so the two never drift
+PLANETS = tuple(name.title() for name in _PLANET_CODES)
+
+def planet_obj(eph, planet_name):
+    """Get planet object from ephemeris, handling barycenter fallback."""
+    code = _PLANET_CODES.get(planet_name.lower())
+    if code is None:
+        raise ValueError(f"Unknown planet: {planet_name}")
+    
+    obj = eph[code]
+    if hasattr(obj, 'planet'):
+        return obj.planet
+    return obj
+
+def resolve_bodies(eph):
+    """Map every selectable planet name, plus 'Earth', to its resolved ephemeris body."""
+    bodies = {name: planet_obj(eph, name) for name in PLANETS}
+    bodies['Earth'] = eph['earth']
+    return bodies
+
+# ============================================================================
+# ECLIPTIC LONGITUDE & ANGLE HELPERS
+# ============================================================================
+
+def angular_distance_deg(angle1, angle2):
+    """Minimal circular distance in [0, 180]; branchless, so scalars and arrays both work."""
+    return abs((angle1 - angle2 + 180.0) % 360.0 - 180.0)
+
+# ICRF -> J2000 ecliptic rotation; the same constant frame ecliptic_latlon() uses
+_ECLIPTIC_J2000 = ecliptic_J2000_frame.rotation_at(None)
+
+def ecliptic_longitude_deg(position):
+    """J2000 ecliptic longitude in degrees of a Skyfield position, as ecliptic_latlon()[1] but
+    without building the unused latitude and distance."""
+    x, y = _ECLIPTIC_J2000[:2] @ position.position.au
+    return np.degrees(np.arctan2(y, x))
+
+# Bound on the gap between coarse_separation() and separation(). Skipping light-time
+# shifts Mercury/Venus by up to ~0.01° each (a Mercury-Venus pair by ~0.018° over
+# 1900-2050), the Moon and outer planets by less
+COARSE_TOLERANCE_DEG = 0.05
+
+def _geocentric_segments(body, earth):
+    """Signed SPK segments whose sum is the geocentric vector of body (shared legs cancel)."""
+    # Bodies with a single segment from the barycenter come back unwrapped
+    body_segments = [vf.spk_segment for vf in getattr(body, 'vector_functions', [body])]
+    earth_segments = [vf.spk_segment for vf in getattr(earth, 'vector_functions', [earth])]
+    return ([(seg, 1.0) for seg in body_segments if seg not in earth_segments] +
+            [(seg, -1.0) for seg in earth_segments if seg not in body_segments])
+
+class PlanetScanner:
+    """Angle evaluator for one planet pair; bodies and Earth are resolved once, not per call."""
+    
+    def __init__(self, bodies, ts, planet1, planet2):
+        self._ts = ts
+        self._earth = bodies['Earth']
+        self._body1 = bodies[planet1]
+        self._body2 = bodies[planet2]
+        self._segments1 = _geocentric_segments(self._body1, self._earth)
+        self._segments2 = _geocentric_segments(self._body2, self._earth)
+    
+    def coarse_separation(self, tdb):
+        """
+        Approximate separation in [0, 360) for an array of TDB Julian dates.
+        
+        Evaluates the DE421 Chebyshev series directly through jplephem (vectorized
+        NumPy) for geometric positions, skipping Skyfield's light-time iteration.
+        Agrees with separation() to within COARSE_TOLERANCE_DEG. Returns float32.
+        """
+        computed = {}
+        
+        def ecliptic_longitude(segments):
+            xyz = 0.0
+            for segment, sign in segments:
+                if segment not in computed:
+                    computed[segment] = segment.compute(tdb)[:3]
+                xyz = xyz + sign * computed[segment]
+            # Segment sums cancel large barycentric vectors, so they stay float64;
+            # the trigonometry only needs float32 (~1e-5° at 360°)
+            x, y = (_ECLIPTIC_J2000[:2] @ xyz).astype(np.float32)
+            return np.degrees(np.arctan2(y, x))
+        
+        separation = (ecliptic_longitude(self._segments1) - ecliptic_longitude(self._segments2)) % np.float32(360.0)
+        # A tiny negative float32 difference rounds up to exactly 360 under the modulo
+        return np.where(separation >= np.float32(360.0), np.float32(0.0), separation)
+    
+    def coarse_samples(self, start_date, end_date, step_minutes):
+        """
+        Coarse grid over [start_date, end_date]: (TT Julian dates, coarse_separation()).
+        
+        The grid is built as TT Julian dates by NumPy arithmetic (only the bounds go
+        through datetime conversion) and evaluated in a single vectorized call.
+        """
+        n_steps = int(np.ceil((end_date - start_date) / timedelta(minutes=step_minutes)))
+        tt_start, tt_end = self._ts.from_datetime(start_date).tt, self._ts.from_datetime(end_date).tt
+        tt = np.minimum(tt_start + np.arange(n_steps + 1) * (step_minutes / MINUTES_PER_DAY), tt_end)
+        return tt, self.coarse_separation(self._ts.tt_jd(tt).tdb)
+    
+    def separation(self, t):
+        """Geocentric ecliptic longitude separation in [0, 360)."""
+        # One barycentric Earth state serves both observations
+        earth_at = self._earth.at(t)
+        lon1 = ecliptic_longitude_deg(earth_at.observe(self._body1))
+        lon2 = ecliptic_longitude_deg(earth_at.observe(self._body2))
+        return (lon1 - lon2) % 360.0
+    
+    def separations_at(self, tts):
+        """separation() at an array of TT Julian dates (any shape), in one Skyfield call."""
+        tts = np.asarray(tts, dtype=np.float64)
+        return np.reshape(self.separation(self._ts.tt_jd(tts.ravel())), tts.shape)
+    
+    def sep_to_target(self, tt, target):
+        """Absolute minimal separation to target angle in [0, 180] at TT Julian date tt."""
+        return abs(self.residual(tt, target))
+    
+    def residuals(self, tts, target):
+        """Signed separation minus target (scalar or broadcast per date), wrapped to [-180, 180)."""
+        return (self.separations_at(tts) - target + 180.0) % 360.0 - 180.0
+    
+    def residual(self, tt, target):
+        """Signed separation minus target, wrapped to [-180, 180), at TT Julian date tt."""
+        return self.residuals((tt,), target)[0]
+
+# ============================================================================
+# COARSE HIT DETECTION
+# ============================================================================
+
+def detect_hits(separation, targets, orb, tolerance=0.0):
+    """
+    Locate coarse brackets that hold a harmonic hit, for all target angles at once.
+    
+    Parameters:
+    - separation: (N,) array of sampled separations in degrees, in time order
+    - targets: (K,) array of target angles in degrees
+    - tolerance: bound on the error of the sampled separations in degrees
+    
+    Returns:
+    - list of (lo_idx, sample_idx, hi_idx, target_idx); each hit's exact time lies
+      between samples lo_idx and hi_idx, and sample_idx is the closest sample
+    """
+    def distance(sep, target):
+        # Both sides lie in [0, 360], so the wrap is a single fold (about twice as fast as
+        # the modulo in angular_distance_deg)
+        d = np.abs(sep - target)
+        return np.minimum(d, 360.0 - d)
+    
+    n = len(separation)
+    
+    # Prefilter on the nearest target: across one sample the distance to any target
+    # changes by at most the separation's own change, so a sample whose nearest target is
+    # further than that beyond the orb cannot be a candidate for any target (the small
+    # margin absorbs float32 rounding)
+    step = np.pad(distance(separation[1:], separation[:-1]), 1)
+    sep_reach = np.maximum(step[:-1], step[1:])
+    ring = np.sort(targets)
+    ring = np.concatenate(([ring[-1] - 360.0], ring, [ring[0] + 360.0]))
+    # Clipped so a separation of exactly 360 (same as 0) still finds its ring neighbours
+    pos = np.minimum(np.searchsorted(ring, separation, side='right'), len(ring) - 1)
+    nearest = np.minimum(separation - ring[pos - 1], ring[pos] - separation)
+    rows = np.flatnonzero(nearest - sep_reach <= orb + tolerance + 1e-3)
+    
+    # Full samples x targets distances, only for the surviving samples and their neighbours
+    at_start, at_end = (rows == 0)[:, None], (rows == n - 1)[:, None]
+    dist = distance(separation[rows, None], targets[None, :])
+    dist_prev = distance(separation[np.maximum(rows - 1, 0), None], targets[None, :])
+    dist_next = distance(separation[np.minimum(rows + 1, n - 1), None], targets[None, :])
+    
+    # Sampled local minima of the distance (ties go to the earlier sample)
+    is_min = ((dist <= dist_prev) | at_start) & ((dist < dist_next) | at_end)
+    
+    # Between samples the distance cannot drop by more than it changes across one
+    # sample, so this bound never discards a minimum that reaches the orb
+    reach = np.maximum(np.where(at_start, 0.0, np.abs(dist - dist_prev)),
+                       np.where(at_end, 0.0, np.abs(dist_next - dist)))
+    
+    row_idx, target_idx = np.nonzero(is_min & (dist - reach <= orb + tolerance))
+    
+    # Candidates in target order, then time order
+    order = np.lexsort((row_idx, target_idx))
+    sample_idx, target_idx = rows[row_idx[order]], target_idx[order]
+    sample_dist = dist[row_idx[order], target_idx]
+    
+    # The exact minimum can lie wherever the sampled distance is within 2 * tolerance of
+    # the candidate's, which spans many samples for slow pairs; each bracket runs out to
+    # the nearest sample on either side that rules it out
+    limit = sample_dist + 2.0 * tolerance
+    lo, hi = np.maximum(sample_idx - 1, 0), np.minimum(sample_idx + 1, n - 1)
+    keep = np.ones(len(sample_idx), dtype=bool)
+    
+    # Most brackets end at the neighbouring samples, where no other candidate can sit
+    # (sampled minima are never adjacent); only the others are walked out one by one
+    wide = (((lo > 0) & (distance(separation[lo], targets[target_idx]) <= limit)) |
+            ((hi < n - 1) & (distance(separation[hi], targets[target_idx]) <= limit)))
+    first = np.searchsorted(target_idx, np.arange(len(targets) + 1))
+    for i in np.flatnonzero(wide):
+        k = target_idx[i]
+        while lo[i] > 0 and distance(separation[lo[i]], targets[k]) <= limit[i]:
+            lo[i] -= 1
+        while hi[i] < n - 1 and distance(separation[hi[i]], targets[k]) <= limit[i]:
+            hi[i] += 1
+        
+        # A bracket holding a lower candidate is the same minimum seen through the
+        # coarse error (or sampling noise on a plateau); only the lowest is refined
+        js = sample_idx[first[k]:first[k + 1]]
+        a = first[k] + np.searchsorted(js, lo[i])
+        b = first[k] + np.searchsorted(js, hi[i], side='right')
+        keep[i] = a + np.argmin(sample_dist[a:b]) == i
+    
+    return list(zip(lo[keep].tolist(), sample_idx[keep].tolist(), hi[keep].tolist(),
+                    target_idx[keep].tolist()))
+
+# ============================================================================
+# REFINEMENT ALGORITHMS (LOCKSTEP BISECTION / PARABOLIC MINIMIZATION)
+# ============================================================================
+
+def refine_hits(scanner, tt_lo, tt_mid, tt_hi, targets, tol_seconds=1.0):
+    """
+    Refine coarse brackets to exact hit times; all arguments are per-bracket arrays
+    (TT Julian dates and target angles).
+    
+    Crossings of the target angle are bisected in lockstep on the signed residual, so
+    each iteration is one Skyfield call for every bracket; near-misses (a minimum that
+    never reaches the target) fall back to Brent's parabolic minimization seeded with
+    the three samples. Returns (tt, delta) arrays, NaN where a bracket holds no crossing
+    and no interior minimum.
+    """
+    r_lo, r_mid, r_hi = scanner.residuals(np.stack((tt_lo, tt_mid, tt_hi)), targets)
+    
+    # A sign change across the ±180° wrap is not a crossing of the target
+    def crosses(r_a, r_b):
+        return (r_a * r_b <= 0) & (np.abs(r_a - r_b) < 180.0)
+    
+    in_first = crosses(r_lo, r_mid)
+    crossing = in_first | crosses(r_mid, r_hi)
+    a, r_a = np.where(in_first, tt_lo, tt_mid)[crossing], np.where(in_first, r_lo, r_mid)[crossing]
+    b, r_b = np.where(in_first, tt_mid, tt_hi)[crossing], np.where(in_first, r_mid, r_hi)[crossing]
+    crossing_targets = targets[crossing]
+    
+    # Halve every root bracket until the widest is within tolerance
+    tol = tol_seconds / 86400.0
+    n_iter = int(np.ceil(np.log2(max(np.max(b - a, initial=0.0), tol) / tol)))
+    for _ in range(n_iter):
+        m = 0.5 * (a + b)
+        r_m = scanner.residuals(m, crossing_targets)
+        left = r_a * r_m <= 0
+        b, r_b = np.where(left, m, b), np.where(left, r_m, r_b)
+        a, r_a = np.where(left, a, m), np.where(left, r_a, r_m)
+    
+    tt_hit = np.full(len(targets), np.nan)
+    delta = np.full(len(targets), np.nan)
+    tt_hit[crossing] = np.where(np.abs(r_a) <= np.abs(r_b), a, b)
+    delta[crossing] = np.minimum(np.abs(r_a), np.abs(r_b))
+    
+    for i in np.flatnonzero(~crossing):
+        try:
+            tt_best, diff_best = refine_hit_time_parabolic(
+                scanner, tt_lo[i], tt_mid[i], tt_hi[i], targets[i],
+                abs(r_lo[i]), abs(r_mid[i]), abs(r_hi[i])
+            )
+        except Exception:
+            continue
+        # A minimum not below both bracket ends sits on the edge of a clamped bracket (scan
+        # or chunk boundary); it is either outside the range or owned by the next chunk
+        if diff_best < min(abs(r_lo[i]), abs(r_hi[i])):
+            tt_hit[i], delta[i] = tt_best, diff_best
+    
+    return tt_hit, delta
+
+def refine_hit_time_parabolic(scanner, tt_lo, tt_mid, tt_hi, target, f_lo, f_mid, f_hi,
+                              max_iter=40, tol_seconds=3.0):
+    """
+    Brent's minimization (parabolic interpolation with golden-section fallback) of the
+    distance to target over [tt_lo, tt_hi]; f_* are the distances at the three samples.
+    
+    The first step is the vertex of the parabola through the three bracket samples,
+    so a smooth near-miss typically converges in a handful of evaluations.
+    """
+    cgold = 0.5 * (3.0 - np.sqrt(5.0))
+    tol = tol_seconds / 86400.0
+    
+    # x is the best point so far, w the second best and v the previous w
+    a, b = tt_lo, tt_hi
+    (fx, x), (fw, w), (fv, v) = sorted(((f_mid, tt_mid), (f_lo, tt_lo), (f_hi, tt_hi)))
+    d = e = b - a
+    
+    for _ in range(max_iter):
+        xm = 0.5 * (a + b)
+        if abs(x - xm) <= 2.0 * tol - 0.5 * (b - a):
+            break
+        
+        use_golden = True
+        if abs(e) > tol:
+            # Vertex of the parabola through x, w and v
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2.0 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            e_prev, e = e, d
+            # Accept it only if it falls inside the bracket and shrinks the step
+            if abs(p) < abs(0.5 * q * e_prev) and q * (a - x) < p < q * (b - x):
+                d = p / q
+                if (x + d) - a < 2.0 * tol or b - (x + d) < 2.0 * tol:
+                    d = tol if xm >= x else -tol
+                use_golden = False
+        if use_golden:
+            e = (a - x) if x >= xm else (b - x)
+            d = cgold * e
+        
+        u = x + d if abs(d) >= tol else x + (tol if d > 0 else -tol)
+        fu = scanner.sep_to_target(u, target)
+        
+        if fu <= fx:
+            if u >= x:
+                a = x
+            else:
+                b = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+    
+    return x, fx
+
+# ============================================================================
+# HARMONIC TIMING SCANNER
+# ============================================================================
+
+# Result columns and their dtypes; all are Arrow-native (NumPy-backed or categorical),
+# so the table and CSV encode without per-row Python objects
+RESULT_DTYPES = {
+    "DateTime (UTC)": "datetime64[ns, UTC]",
+    "Planet 1": "category",
+    "Planet 2": "category",
+    "Angle": "float32",
+    "Δ (deg)": "float32",
+}
+RESULT_COLUMNS = list(RESULT_DTYPES)
+
+def scan_harmonic_timing_refined(bodies, ts, planet1, planet2, harmonic_angles, orb,
+                                 start_date, end_date, step_minutes=60, coarse=None):
+    """
+    Scan date range for harmonic angle hits between two planets.
+    
+    Parameters:
+    - bodies: name -> body mapping from resolve_bodies() / get_bodies()
+    - start_date, end_date: timezone-aware datetime objects in UTC
+    - harmonic_angles: list of target angles in degrees
+    - coarse: PlanetScanner.coarse_samples() for this pair, range and step, if already
+      computed
+    
+    Returns:
+    - DataFrame with RESULT_COLUMNS as RESULT_DTYPES, sorted by time, with raw (unformatted) values
+    """
+    scanner = PlanetScanner(bodies, ts, planet1, planet2)
+    
+    # Coarse pass straight from the ephemeris's Chebyshev coefficients; float32 is ample
+    # for the orb test and halves the coarse arrays; refinement below stays in float64
+    if coarse is None:
+        coarse = scanner.coarse_samples(start_date, end_date, step_minutes)
+    tt, separation = coarse
+    
+    # Refine only where the distance to a target has a local minimum that can reach the orb
+    # (widened by the coarse model's error; the refiner uses full Skyfield astrometry)
+    targets = np.asarray(harmonic_angles, dtype=np.float64)
+    brackets = detect_hits(separation, targets.astype(np.float32), orb, COARSE_TOLERANCE_DEG)
+    
+    # Hits are stored column-wise (times as TT Julian dates); all brackets are refined
+    # together and each yields at most one hit
+    lo, j, hi, k = np.array(brackets, dtype=np.intp).reshape(-1, 4).T
+    if len(brackets):
+        hit_tts, hit_deltas = refine_hits(scanner, tt[lo], tt[j], tt[hi], targets[k])
+    else:
+        hit_tts = hit_deltas = np.empty(0)
+    found = hit_deltas <= orb
+    hit_tts, hit_angles, hit_deltas = hit_tts[found], targets[k][found], hit_deltas[found]
+    
+    # Deduplicate: remove events within 30 seconds of the preceding one (vectorized)
+    order = np.argsort(hit_tts, kind='stable')
+    gaps = np.diff(hit_tts[order], prepend=-np.inf) * 86400.0
+    keep = order[gaps > 30]
+    
+    # One TT -> UTC conversion for all kept hits, straight into a datetime64 column
+    return pd.DataFrame({
+        "DateTime (UTC)": utc_timestamps(ts.tt_jd(hit_tts[keep])),
+        "Planet 1": planet1,
+        "Planet 2": planet2,
+        "Angle": hit_angles[keep],
+        "Δ (deg)": hit_deltas[keep],
+    }, columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+
+# Ceiling for the adaptive coarse step; keeps refinement brackets to a few days
+MAX_STEP_MINUTES = MINUTES_PER_DAY
+
+def adaptive_step_minutes(scanner, ts, orb, start_date, end_date, step_minutes):
+    """
+    Coarse step for a pair: the requested step, widened for slow pairs so that each
+    step still covers at most orb/2 of relative motion (capped at MAX_STEP_MINUTES).
+    
+    The fastest relative motion is estimated from the coarse model sampled daily
+    across the scan range. Widened steps are the requested step times a power of two,
+    so orbs within the same factor-of-two band share one chunk grid (and its cached
+    coarse samples).
+    """
+    n_days = (end_date - start_date).days + 2
+    days = ts.tt_jd(ts.from_datetime(start_date).tt + np.arange(n_days))
+    separation = scanner.coarse_separation(days.tdb)
+    max_rate = angular_distance_deg(separation[1:], separation[:-1]).max() / MINUTES_PER_DAY
+    widen = max(0.5 * orb / max_rate / step_minutes, 1.0)
+    return int(min(step_minutes * 2 ** int(np.log2(widen)), MAX_STEP_MINUTES))
+
+# Coarse steps per scan chunk: large enough to keep the vectorized passes efficient,
+# small enough that long scans report progress and cache piecewise
+SCAN_CHUNK_STEPS = 1000
+
+def scan_chunks(start_date, end_date, step_minutes, chunk_steps=SCAN_CHUNK_STEPS):
+    """Split a scan range into consecutive (start, end) windows on the same coarse grid."""
+    chunk = timedelta(minutes=step_minutes * chunk_steps)
+    n_chunks = max(int(np.ceil((end_date - start_date) / chunk)), 1)
+    return [(start_date + chunk * k, min(start_date + chunk * (k + 1), end_date))
+            for k in range(n_chunks)]
+
+def scan_chunk(bodies, ts, job):
+    """
+    Scan one chunk; job holds scan_harmonic_timing_refined()'s arguments after bodies and
+    ts, with coarse last (None to compute it here). Returns (results, coarse samples).
+    """
+    planet1, planet2, harmonic_angles, orb, start_date, end_date, step_minutes, coarse = job
+    if coarse is None:
+        coarse = PlanetScanner(bodies, ts, planet1, planet2).coarse_samples(start_date, end_date, step_minutes)
+    return scan_harmonic_timing_refined(bodies, ts, *job[:-1], coarse), coarse
+
+def merge_scan_chunks(frames):
+    """Concatenate per-chunk results in order, dropping a hit found by both sides of a boundary."""
+    frames = [frame for frame in frames if len(frame) > 0]
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+    
+    df = pd.concat(frames, ignore_index=True)
+    gaps = df["DateTime (UTC)"].diff().dt.total_seconds()
+    return df[gaps.isna() | (gaps > 30)].reset_index(drop=True)
+
+# ============================================================================
+# COARSE SAMPLE CACHE
+# ============================================================================
+
+class CoarseSampleStore:
+    """
+    Thread-safe LRU of PlanetScanner.coarse_samples() results, keyed on
+    (planet1, planet2, start_iso, end_iso, step_minutes).
+    
+    Lookup and insertion are separate calls, so a caller can hand cached samples to a
+    worker process and keep the ones a worker computed. Given a directory, entries are
+    also kept there as .npz files that outlive the process; the least recently used
+    files are deleted once the directory grows past max_bytes.
+    """
+    
+    # Part of every file name; bump it when coarse_samples() changes so old files are ignored
+    DISK_FORMAT = 1
+    
+    def __init__(self, max_entries, directory=None, max_bytes=0):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._directory = directory
+        self._max_bytes = max_bytes
+        # Total size of the directory's files, counted on the first write
+        self._disk_bytes = None
+    
+    def get(self, key):
+        """Cached samples for key (from memory, else from disk), or None."""
+        with self._lock:
+            samples = self._entries.get(key)
+            if samples is not None:
+                self._entries.move_to_end(key)
+                return samples
+        if self._directory is None:
+            return None
+        
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                samples = data['tt'], data['separation']
+            # A file's mtime is its last use, for pruning
+            os.utime(path)
+        except Exception:
+            # Missing, or unreadable (e.g. removed by another process's pruning)
+            return None
+        self._remember(key, samples)
+        return samples
+    
+    def put(self, key, samples):
+        """Keep samples for key, in memory and (if not there yet) on disk."""
+        self._remember(key, samples)
+        if self._directory is None:
+            return
+        try:
+            self._write(key, samples)
+        except OSError:
+            # The disk copy is best-effort (e.g. a read-only working directory)
+            pass
+    
+    def _remember(self, key, samples):
+        with self._lock:
+            self._entries[key] = samples
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def _path(self, key):
+        digest = hashlib.sha1(repr((self.DISK_FORMAT, key)).encode()).hexdigest()
+        return os.path.join(self._directory, digest + '.npz')
+    
+    def _write(self, key, samples):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        
+        # Written under a unique name and renamed into place, so readers (in this or
+        # another server process) never see a partial file
+        os.makedirs(self._directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        tt, separation = samples
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, tt=tt, separation=separation)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            else:
+                self._disk_bytes += os.path.getsize(path)
+            if self._disk_bytes > self._max_bytes:
+                self._prune()
+    
+    def _disk_files(self):
+        """(mtime, size, path) of every stored file, oldest first."""
+        files = []
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+    
+    def _prune(self):
+        """Delete the least recently used files until the directory is at 90% of max_bytes."""
+        files = self._disk_files()
+        self._disk_bytes = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._disk_bytes <= 0.9 * self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._disk_bytes -= size
+
+# ============================================================================
+# WORKER PROCESSES
+# ============================================================================
+
+# Worker processes for long scans; with a single CPU the cached serial path is used.
+# Counts the CPUs this process may run on (a container's CPU set, not the host's cores),
+# capped since each worker holds its own ephemeris
+SCAN_WORKERS = min(8, len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity')
+                   else os.cpu_count() or 1)
+
+# Workers start from a fresh interpreter that imports this module by name, never by
+# forking the Streamlit server: a fork from a dispatch thread inherits whatever script
+# run's __main__ is installed at that moment, and Streamlit replaces it on every run
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context('forkserver')
+    _MP_CONTEXT.set_forkserver_preload([__name__])
+else:
+    _MP_CONTEXT = multiprocessing.get_context('spawn')
+
+_worker_bodies = None
+
+def _init_scan_worker():
+    """Load the ephemeris once per worker process (Streamlit caches are per process)."""
+    global _worker_bodies
+    _worker_bodies = (resolve_bodies(load('de421.bsp')), load.timescale())
+
+def _scan_chunk_worker(job):
+    """scan_chunk() in a worker process, with the worker's ephemeris."""
+    bodies, ts = _worker_bodies
+    return scan_chunk(bodies, ts, job)
+
+def scan_worker_pool(max_workers):
+    """Process pool whose workers each hold a loaded ephemeris for _scan_chunk_worker()."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT,
+                               initializer=_init_scan_worker)
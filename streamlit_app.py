@@ -1,9 +1,21 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
+import os
+import time
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from skyfield.api import load
 import numpy as np
 
+from luminara_scan import (
+    MINUTES_PER_DAY, PLANETS, RESULT_COLUMNS, RESULT_DTYPES, SCAN_WORKERS, CoarseSampleStore,
+    PlanetScanner, _scan_chunk_worker, adaptive_step_minutes, merge_scan_chunks,
+    resolve_bodies, scan_chunk, scan_chunks, scan_worker_pool
+)
+
 # ============================================================================
 # CONFIGURATION & SETUP
 # ============================================================================
@@ -13,8 +25,8 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS for bordered card layout
-st.markdown("""
+# Custom CSS for bordered card layout (injected by main() on every run)
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -45,7 +57,44 @@ st.markdown("""
         border-radius: 4px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Welcome card body, shown whenever no scan is running
+WELCOME_MD = """
+Configure your scan in the sidebar and click **Run Harmonic Scan** to begin.
+
+**Two Modes Available:**
+
+**Harmonics Mode:**
+- Scan for predefined harmonic angles (0°, 45°, 60°, 90°, etc.)
+- Select multiple angles to detect simultaneously
+- Classic astrological aspects and divisions
+
+**Fingerprint Mode:**
+- Capture the exact planetary angle at a specific moment (anchor datetime)
+- Scan forward to find when that exact angle recurs
+- Perfect for identifying cyclical patterns and timing repetitions
+
+**Technical Features:**
+- High-precision planetary ephemeris (JPL DE421)
+- Geocentric ecliptic longitudes (tropical)
+- Batched root finding for second-level accuracy
+- Bracket-and-refine algorithm eliminates grid snapping
+- Custom orb tolerance and scan step size
+
+**How It Works:**
+1. Coarse scan divides time range into brackets (step size)
+2. Each bracket is checked for proximity to target angles
+3. Promising brackets are refined by root finding (crossings) or parabolic minimization (near-misses)
+4. Only hits within orb tolerance are recorded
+5. Results show exact time with second precision
+
+**Coming Soon:**
+- Asset price anchoring
+- Square of 9 projection ladders
+- Historical backlog database
+- Alert system with notifications
+"""
 
 # ============================================================================
 # DATETIME UTILITIES
@@ -63,191 +112,132 @@ def date_to_utc_datetime(date_obj, hour=0, minute=0, second=0):
 # EPHEMERIS & PLANETARY SETUP
 # ============================================================================
 
-@st.cache_resource
+@st.cache_resource(show_spinner=False)
+def _ephemeris_future():
+    """Start loading the JPL DE421 ephemeris and timescale in a background thread (once per process)."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(lambda: (load('de421.bsp'), load.timescale()))
+    executor.shutdown(wait=False)
+    return future
+
 def get_ephemeris():
     """Load JPL DE421 ephemeris file and timescale (cached for performance)."""
-    ts = load.timescale()
-    eph = load('de421.bsp')
-    return eph, ts
-
-def planet_obj(eph, planet_name):
-    """Get planet object from ephemeris, handling barycenter fallback."""
-    planet_map = {
-        'sun': 10, 'moon': 301, 'mercury': 1, 'venus': 2, 'mars': 4,
-        'jupiter': 5, 'saturn': 6, 'uranus': 7, 'neptune': 8, 'pluto': 9
-    }
-    
-    code = planet_map.get(planet_name.lower())
-    if code is None:
-        raise ValueError(f"Unknown planet: {planet_name}")
-    
-    obj = eph[code]
-    if hasattr(obj, 'planet'):
-        return obj.planet
-    return obj
+    future = _ephemeris_future()
+    try:
+        return future.result()
+    except Exception:
+        # A failed load is not kept; the next run starts a fresh one
+        _ephemeris_future.clear()
+        raise
 
-# ============================================================================
-# ECLIPTIC LONGITUDE & ANGLE HELPERS
-# ============================================================================
+# Harmonic angles offered in Harmonics mode
+ANGLE_OPTIONS = (0, 45, 60, 90, 120, 135, 180, 270, 360)
 
-def ecliptic_longitude_deg(eph, ts, planet_name, t):
-    """Calculate geocentric ecliptic longitude (tropical) of a planet at time t."""
-    earth = eph['earth']
-    planet = planet_obj(eph, planet_name)
-    astrometric = earth.at(t).observe(planet)
-    lat, lon, distance = astrometric.ecliptic_latlon()
-    return lon.degrees % 360.0
-
-def angle_between_ecliptic_longitudes_deg(eph, ts, planet1, planet2, t):
-    """Geocentric ecliptic longitude separation in [0, 360)."""
-    lon1 = ecliptic_longitude_deg(eph, ts, planet1, t)
-    lon2 = ecliptic_longitude_deg(eph, ts, planet2, t)
-    return (lon1 - lon2) % 360.0
-
-def angle_diff_to_target_deg(eph, ts, planet1, planet2, t, target):
-    """Absolute minimal separation to target angle in [0, 180]."""
-    separation = angle_between_ecliptic_longitudes_deg(eph, ts, planet1, planet2, t)
-    diff1 = abs(separation - target)
-    diff2 = abs(separation - (target + 360.0)) if target < 180 else abs(separation - (target - 360.0))
-    diff3 = 360.0 - diff1
-    return min(diff1, diff2, diff3)
+@st.cache_resource
+def get_bodies(_eph):
+    """Resolved bodies for the loaded ephemeris, built once per process (_eph is not hashed)."""
+    return resolve_bodies(_eph)
 
 # ============================================================================
-# REFINEMENT ALGORITHM (GOLDEN SECTION SEARCH)
+# HARMONIC TIMING SCANNER
 # ============================================================================
 
-def refine_hit_time_golden(eph, ts, planet1, planet2, t_lo, t_hi, target,
-                           max_iter=15, tol_seconds=3.0):
-    """Golden-section search to find exact harmonic hit time."""
-    phi = (1.0 + np.sqrt(5.0)) / 2.0
-    resphi = 2.0 - phi
-    
-    a = t_lo.utc_datetime().timestamp()
-    b = t_hi.utc_datetime().timestamp()
-    
-    if (b - a) < tol_seconds:
-        t_mid = ts.from_datetime(datetime.fromtimestamp((a + b) / 2, tz=timezone.utc))
-        diff_mid = angle_diff_to_target_deg(eph, ts, planet1, planet2, t_mid, target)
-        return t_mid, diff_mid
-    
-    x1 = a + resphi * (b - a)
-    x2 = b - resphi * (b - a)
-    
-    t1 = ts.from_datetime(datetime.fromtimestamp(x1, tz=timezone.utc))
-    t2 = ts.from_datetime(datetime.fromtimestamp(x2, tz=timezone.utc))
-    
-    f1 = angle_diff_to_target_deg(eph, ts, planet1, planet2, t1, target)
-    f2 = angle_diff_to_target_deg(eph, ts, planet1, planet2, t2, target)
+# Display formats for the raw result columns
+RESULT_COLUMN_CONFIG = {
+    "DateTime (UTC)": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+    "Angle": st.column_config.NumberColumn(format="%.1f"),
+    "Δ (deg)": st.column_config.NumberColumn(format="%.3f"),
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_scan(planet1, planet2, harmonic_angles, orb, start_iso, end_iso, step_minutes,
+                 _executor=None):
+    """
+    Memoized scan keyed on hashable parameters.
     
-    for _ in range(max_iter):
-        if (b - a) < tol_seconds:
-            break
-        
-        if f1 < f2:
-            b = x2
-            x2 = x1
-            f2 = f1
-            x1 = a + resphi * (b - a)
-            t1 = ts.from_datetime(datetime.fromtimestamp(x1, tz=timezone.utc))
-            f1 = angle_diff_to_target_deg(eph, ts, planet1, planet2, t1, target)
-        else:
-            a = x1
-            x1 = x2
-            f1 = f2
-            x2 = b - resphi * (b - a)
-            t2 = ts.from_datetime(datetime.fromtimestamp(x2, tz=timezone.utc))
-            f2 = angle_diff_to_target_deg(eph, ts, planet1, planet2, t2, target)
+    harmonic_angles is a tuple and the bounds are ISO-8601 strings so Streamlit can
+    hash them; the ephemeris comes from the cache_resource loader. No UI side effects
+    happen in here, so a cache hit skips all ephemeris work. A cache miss runs in
+    _executor's worker processes when one is given (left out of the cache key).
     
-    return (t1, f1) if f1 < f2 else (t2, f2)
+    The coarse samples do not depend on the angles or orb, so they are looked up in
+    get_coarse_store() and sent along with the job; on a store miss the coarse pass runs
+    wherever the scan does (in the worker, off this process's GIL) and is stored after.
+    """
+    key = (planet1, planet2, start_iso, end_iso, step_minutes)
+    store = get_coarse_store()
+    job = (planet1, planet2, list(harmonic_angles), orb, datetime.fromisoformat(start_iso),
+           datetime.fromisoformat(end_iso), step_minutes, store.get(key))
+    if _executor is not None:
+        df, coarse = _executor.submit(_scan_chunk_worker, job).result()
+    else:
+        eph, ts = get_ephemeris()
+        df, coarse = scan_chunk(get_bodies(eph), ts, job)
+    store.put(key, coarse)
+    return df
 
-# ============================================================================
-# HARMONIC TIMING SCANNER
-# ============================================================================
+# Coarse sample chunks kept in memory per process; each is a few kilobytes
+COARSE_CACHE_ENTRIES = 256
+
+# On-disk copy of the coarse samples, relative to the working directory like de421.bsp;
+# it survives restarts and is pruned back once it passes COARSE_CACHE_BYTES
+COARSE_CACHE_DIR = os.path.join('.luminara_cache', 'coarse')
+COARSE_CACHE_BYTES = 500_000_000
 
-def scan_harmonic_timing_refined(eph, ts, planet1, planet2, harmonic_angles, orb,
-                                 start_date, end_date, step_minutes=60):
+@st.cache_resource
+def get_coarse_store():
     """
-    Scan date range for harmonic angle hits between two planets.
-    
-    Parameters:
-    - start_date, end_date: timezone-aware datetime objects in UTC
-    - harmonic_angles: list of target angles in degrees
-    
-    Returns:
-    - List of dicts with keys: "DateTime (UTC)", "Planet 1", "Planet 2", "Angle", "Δ (deg)"
+    Coarse samples shared by all sessions and both scan paths. The ephemeris never
+    changes, so entries do not expire; rescans that only change the angles, or the orb
+    within a slow pair's adaptive step band (see adaptive_step_minutes()), reuse them,
+    as do later server processes through the on-disk copy.
     """
-    events = []
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    total_minutes = (end_date - start_date).total_seconds() / 60
-    minutes_processed = 0
-    current_dt = start_date
-    brackets_processed = 0
-    update_frequency = max(1, int(total_minutes / step_minutes / 100))
-    
-    while current_dt <= end_date:
-        next_dt = min(current_dt + timedelta(minutes=step_minutes), end_date)
-        
-        t_lo = ts.from_datetime(current_dt)
-        t_hi = ts.from_datetime(next_dt)
-        mid_dt = current_dt + (next_dt - current_dt) / 2
-        t_mid = ts.from_datetime(mid_dt)
-        
-        for target_angle in harmonic_angles:
-            mid_diff = angle_diff_to_target_deg(eph, ts, planet1, planet2, t_mid, target_angle)
-            
-            if mid_diff > orb * 2.0:
-                continue
-            
-            lo_diff = angle_diff_to_target_deg(eph, ts, planet1, planet2, t_lo, target_angle)
-            hi_diff = angle_diff_to_target_deg(eph, ts, planet1, planet2, t_hi, target_angle)
-            min_diff_in_bracket = min(mid_diff, lo_diff, hi_diff)
-            
-            if min_diff_in_bracket <= orb * 1.5:
-                try:
-                    t_best, diff_best = refine_hit_time_golden(
-                        eph, ts, planet1, planet2, t_lo, t_hi, target_angle,
-                        max_iter=15, tol_seconds=3.0
-                    )
-                    
-                    if diff_best <= orb:
-                        events.append({
-                            "DateTime (UTC)": t_best.utc_datetime(),
-                            "Planet 1": planet1,
-                            "Planet 2": planet2,
-                            "Angle": float(target_angle),
-                            "Δ (deg)": round(float(diff_best), 3)
-                        })
-                except Exception:
-                    continue
-        
-        brackets_processed += 1
-        minutes_processed += step_minutes
-        
-        if brackets_processed % update_frequency == 0 or current_dt >= end_date:
-            progress = min(minutes_processed / total_minutes, 1.0)
-            progress_bar.progress(progress)
-            status_text.text(f"Scanning: {current_dt.strftime('%Y-%m-%d %H:%M')} ({int(progress*100)}%) | Found: {len(events)} events")
-        
-        current_dt = next_dt
+    return CoarseSampleStore(COARSE_CACHE_ENTRIES, COARSE_CACHE_DIR, COARSE_CACHE_BYTES)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_anchor_angle(planet1, planet2, anchor_iso):
+    """Memoized Fingerprint target: the exact separation at the anchor instant."""
+    eph, ts = get_ephemeris()
+    anchor_t = ts.from_datetime(datetime.fromisoformat(anchor_iso))
+    return float(PlanetScanner(get_bodies(eph), ts, planet1, planet2).separation(anchor_t))
+
+# Minimum seconds between progress bar redraws
+PROGRESS_INTERVAL_S = 0.2
+
+# Scan size (thousands of coarse samples x angles, at the adapted step) above which
+# main() warns; each unit costs about 3 ms on one core, so this is roughly 10 seconds
+COMPLEXITY_THRESHOLD = 3000
+
+def scan_chunks_parallel(planet1, planet2, harmonic_angles, orb, chunks, step_minutes):
+    """
+    Yield each chunk's scan result in order, computing cache misses across SCAN_WORKERS
+    processes.
     
-    progress_bar.empty()
-    status_text.empty()
+    Each chunk still goes through _cached_scan, from threads carrying this script run's
+    context; worker processes only start if some chunk misses the cache.
+    """
+    ctx = get_script_run_ctx()
+    n_workers = min(SCAN_WORKERS, len(chunks))
     
-    # Deduplicate: remove events within 30 seconds of each other
-    if events:
-        events_sorted = sorted(events, key=lambda x: x["DateTime (UTC)"])
-        deduped = [events_sorted[0]]
-        
-        for evt in events_sorted[1:]:
-            if (evt["DateTime (UTC)"] - deduped[-1]["DateTime (UTC)"]).total_seconds() > 30:
-                deduped.append(evt)
-        
-        return deduped
+    with scan_worker_pool(n_workers) as executor, \
+            ThreadPoolExecutor(max_workers=n_workers) as threads:
+        def scan_chunk(chunk):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            chunk_start, chunk_end = chunk
+            return _cached_scan(planet1, planet2, harmonic_angles, orb, chunk_start.isoformat(),
+                                chunk_end.isoformat(), step_minutes, _executor=executor)
+        
+        yield from threads.map(scan_chunk, chunks)
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def results_csv(df):
+    """
+    CSV export of a result frame as UTF-8 bytes (numeric columns at full precision).
     
-    return []
+    Keyed on the frame's content, so a rescan that reproduces the same results (every
+    chunk a cache hit) reuses the serialized bytes.
+    """
+    return df.to_csv(index=False, date_format='%Y-%m-%d %H:%M:%S').encode('utf-8')
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -255,40 +245,74 @@ def scan_harmonic_timing_refined(eph, ts, planet1, planet2, harmonic_angles, orb
 
 def initialize_session_state():
     """Initialize all session state variables with defaults."""
+    # Default dates are computed once per session rather than on every rerun
+    if 'default_start_date' not in st.session_state:
+        today = datetime.now(timezone.utc).date()
+        st.session_state.default_start_date = today
+        st.session_state.default_end_date = today + timedelta(days=14)
+    
     st.session_state.setdefault('mode', 'Harmonics')
     st.session_state.setdefault('planet1', 'Sun')
     st.session_state.setdefault('planet2', 'Moon')
     st.session_state.setdefault('selected_angles', [0, 90, 180])
-    st.session_state.setdefault('anchor_date', datetime.now(timezone.utc).date())
+    st.session_state.setdefault('anchor_date', st.session_state.default_start_date)
     st.session_state.setdefault('anchor_hour', 12)
     st.session_state.setdefault('anchor_minute', 0)
     st.session_state.setdefault('orb', 1.0)
-    st.session_state.setdefault('start_date', datetime.now(timezone.utc).date())
-    st.session_state.setdefault('end_date', (datetime.now(timezone.utc) + timedelta(days=14)).date())
+    st.session_state.setdefault('start_date', st.session_state.default_start_date)
+    st.session_state.setdefault('end_date', st.session_state.default_end_date)
     st.session_state.setdefault('step_minutes', 60)
-    st.session_state.setdefault('harmonics_df', None)
+    st.session_state.setdefault('last_results', None)
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
+def results_section():
+    """Results header with placeholders for the status line and table; returns (status, table)."""
+    st.markdown("---")
+    st.subheader("Harmonic Timing Results")
+    return st.empty(), st.empty()
+
+def show_results(df, cfg, status, table):
+    """Fill a results section with the hit count, the table and the CSV download."""
+    event_type = "recurrence event(s)" if cfg.mode == "Fingerprint" else "harmonic event(s)"
+    if len(df) > 0:
+        status.success(f"Found {len(df)} {event_type}")
+    else:
+        status.info(f"Found 0 {event_type}")
+    
+    # Always display dataframe; columns stay numeric and are formatted by the frontend
+    table.dataframe(df, use_container_width=True, height=400, column_config=RESULT_COLUMN_CONFIG)
+    
+    # CSV download button
+    file_prefix = "fingerprint" if cfg.mode == "Fingerprint" else "harmonics"
+    st.download_button(
+        label="Download Results (CSV)",
+        data=results_csv(df),
+        file_name=f"luminara_{file_prefix}_{cfg.planet1}_{cfg.planet2}_{datetime.now(timezone.utc).strftime('%Y%m%d')}_utc.csv",
+        mime="text/csv"
+    )
+
 def main():
     """Main application function - all logic and UI contained here."""
     
     # Initialize session state
     initialize_session_state()
     
+    # Styles are re-sent every run: Streamlit drops elements a rerun does not emit
+    st.markdown(_CSS, unsafe_allow_html=True)
+    
     # Header
-    st.markdown('<div class="main-header">Luminara</div>', unsafe_allow_html=True)
-    st.markdown('<div class="sub-header">Planetary Harmonics & Financial Timing Dashboard</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="main-header">Luminara</div>'
+        '<div class="sub-header">Planetary Harmonics & Financial Timing Dashboard</div>',
+        unsafe_allow_html=True
+    )
     
-    # Load ephemeris
-    try:
-        eph, ts = get_ephemeris()
-    except Exception as e:
-        st.error(f"Failed to load ephemeris: {e}")
-        st.info("Ensure de421.bsp is in the working directory or Skyfield cache.")
-        return
+    # Start the ephemeris load now so it overlaps rendering the sidebar; the load below
+    # waits for it
+    _ephemeris_future()
     
     # ========================================================================
     # SIDEBAR - Configuration
@@ -308,21 +332,17 @@ def main():
         st.markdown("---")
         
         # Planet selection
-        planets = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 
-                   'Jupiter', 'Saturn', 'Uranus', 'Neptune', 'Pluto']
-        
-        st.selectbox('Planet 1', planets, key="planet1")
-        st.selectbox('Planet 2', planets, key="planet2", index=1)
+        st.selectbox('Planet 1', PLANETS, key="planet1")
+        st.selectbox('Planet 2', PLANETS, key="planet2", index=1)
         
         st.markdown("---")
         
         # Mode-specific inputs
         if st.session_state.mode == "Harmonics":
             st.markdown("**Harmonic Angles**")
-            angle_options = [0, 45, 60, 90, 120, 135, 180, 270, 360]
             st.multiselect(
                 'Select angles (degrees)',
-                options=angle_options,
+                options=ANGLE_OPTIONS,
                 key="selected_angles",
                 help="Fewer angles = faster scan. Start with 2-3 angles for testing."
             )
@@ -381,7 +401,7 @@ def main():
             min_value=30,
             max_value=240,
             key="step_minutes",
-            help="Larger steps = faster scan. Use 60-120 min to avoid timeouts."
+            help="Larger steps = faster scan. Slow planet pairs are sampled more coarsely automatically."
         )
         
         st.markdown("---")
@@ -392,176 +412,145 @@ def main():
         # Performance guidance
         st.markdown("---")
         st.markdown("**Performance Tips**")
-        st.caption("• 7-day scan: ~10-20 seconds")
-        st.caption("• 14-day scan: ~20-40 seconds")
-        st.caption("• 30-day scan: ~60-90 seconds")
-        st.caption("• Use 60+ min steps")
-        st.caption("• Use 2-3 angles for speed")
-        st.caption("• Avoid scans > 30 days on Streamlit Cloud")
+        st.caption("• A year of Moon aspects at 30 min: under a second")
+        st.caption("• Slow planet pairs are sampled coarsely, so decades scan quickly")
+        st.caption("• Decade-long Moon scans: use larger steps or fewer angles")
+        st.caption("• Rerunning with new angles reuses cached ephemeris work")
     
     # ========================================================================
     # MAIN AREA - Results
     # ========================================================================
     
+    # Load ephemeris
+    try:
+        eph, ts = get_ephemeris()
+        bodies = get_bodies(eph)
+    except Exception as e:
+        st.error(f"Failed to load ephemeris: {e}")
+        st.info("Ensure de421.bsp is in the working directory or Skyfield cache.")
+        return
+    
+    # Local snapshot of the sidebar settings for this run
+    cfg = SimpleNamespace(**{key: st.session_state[key] for key in (
+        'mode', 'planet1', 'planet2', 'selected_angles', 'anchor_date', 'anchor_hour',
+        'anchor_minute', 'orb', 'start_date', 'end_date', 'step_minutes',
+    )})
+    # Settings, anchor note and results of the last completed scan
+    last_results = st.session_state.last_results
+    
     if run_scan:
-        if st.session_state.planet1 == st.session_state.planet2:
+        if cfg.planet1 == cfg.planet2:
             st.error("Please select two different planets.")
             return
         
-        if st.session_state.mode == "Harmonics" and not st.session_state.selected_angles:
+        if cfg.mode == "Harmonics" and not cfg.selected_angles:
             st.error("Please select at least one harmonic angle.")
             return
         
-        if st.session_state.start_date >= st.session_state.end_date:
+        if cfg.start_date >= cfg.end_date:
             st.error("End date must be after start date.")
             return
         
+        scanner = PlanetScanner(bodies, ts, cfg.planet1, cfg.planet2)
+        
         # Determine target angles based on mode
-        if st.session_state.mode == "Fingerprint":
+        if cfg.mode == "Fingerprint":
             anchor_dt = date_to_utc_datetime(
-                st.session_state.anchor_date,
-                st.session_state.anchor_hour,
-                st.session_state.anchor_minute
+                cfg.anchor_date,
+                cfg.anchor_hour,
+                cfg.anchor_minute
             )
-            anchor_t = ts.from_datetime(anchor_dt)
-            anchor_angle = angle_between_ecliptic_longitudes_deg(
-                eph, ts, st.session_state.planet1, st.session_state.planet2, anchor_t
+            anchor_angle = _cached_anchor_angle(
+                cfg.planet1, cfg.planet2, anchor_dt.isoformat()
             )
             target_angles = [anchor_angle]
-            st.info(f"**Fingerprint target angle:** {anchor_angle:.2f}° (captured at {anchor_dt.strftime('%Y-%m-%d %H:%M')} UTC)")
+            note = f"**Fingerprint target angle:** {anchor_angle:.2f}° (captured at {anchor_dt.strftime('%Y-%m-%d %H:%M')} UTC)"
+            st.info(note)
         else:
-            target_angles = st.session_state.selected_angles
-        
-        # Calculate scan complexity and warn if too large
-        days_range = (st.session_state.end_date - st.session_state.start_date).days
-        num_angles = len(target_angles)
-        estimated_brackets = (days_range * 24 * 60) / st.session_state.step_minutes
-        complexity_score = (estimated_brackets * num_angles) / 1000
+            target_angles = cfg.selected_angles
+            note = None
         
-        if complexity_score > 2.0:
-            st.warning(f"Large scan detected ({days_range} days × {num_angles} angles). This may take 2-3 minutes or timeout. Consider: shorter range, fewer angles, or larger step size.")
+        # Normalize once to a sorted, duplicate-free tuple of floats: it is hashed as the
+        # cache key and converted straight to a NumPy array in each scan, so the same angle
+        # selection in any order reuses the cached chunks
+        target_angles = tuple(np.unique(np.asarray(target_angles, dtype=np.float64)).tolist())
+        orb = float(cfg.orb)
         
         # Convert dates to UTC-aware datetimes
-        start_dt = date_to_utc_datetime(st.session_state.start_date, 0, 0, 0)
-        end_dt = date_to_utc_datetime(st.session_state.end_date, 23, 59, 59)
+        start_dt = date_to_utc_datetime(cfg.start_date, 0, 0, 0)
+        end_dt = date_to_utc_datetime(cfg.end_date, 23, 59, 59)
         
-        # Run scan
-        mode_label = "fingerprint recurrence" if st.session_state.mode == "Fingerprint" else "planetary harmonics"
+        # Slow pairs need far fewer samples than the requested step gives them
+        step_minutes = adaptive_step_minutes(
+            scanner, ts, orb, start_dt, end_dt, cfg.step_minutes
+        )
         
-        with st.spinner(f'Calculating {mode_label} with precision refinement...'):
-            try:
-                results = scan_harmonic_timing_refined(
-                    eph, ts, st.session_state.planet1, st.session_state.planet2,
-                    target_angles, st.session_state.orb, start_dt, end_dt, st.session_state.step_minutes
-                )
-            except Exception as e:
-                st.error(f"Scan failed: {str(e)}")
-                results = []
+        # Calculate scan complexity from the step actually scanned and warn if too large
+        days_range = (cfg.end_date - cfg.start_date).days
+        num_angles = len(target_angles)
+        estimated_samples = (days_range * MINUTES_PER_DAY) / step_minutes
+        complexity_score = (estimated_samples * num_angles) / 1000
         
-        # Defensive: normalize results to list[dict]
-        if results is None:
-            results = []
-        elif not isinstance(results, list):
-            try:
-                results = list(results)
-            except:
-                results = []
+        if complexity_score > COMPLEXITY_THRESHOLD:
+            st.warning(f"Large scan detected ({days_range} days sampled every {step_minutes} min × {num_angles} angles). This may take 10 seconds or more. Consider: shorter range, fewer angles, or larger step size.")
         
-        # Build DataFrame with exact column specification
+        # Run scan
+        mode_label = "fingerprint recurrence" if cfg.mode == "Fingerprint" else "planetary harmonics"
+        
+        # The status line and table fill in as the scan streams through its chunks
+        status, table = results_section()
+        progress_bar = status.progress(0.0, text=f"Calculating {mode_label} with precision refinement...")
         try:
-            if len(results) > 0:
-                df = pd.DataFrame(results)
-                
-                # Ensure all required columns exist
-                required_cols = ["DateTime (UTC)", "Planet 1", "Planet 2", "Angle", "Δ (deg)"]
-                for col in required_cols:
-                    if col not in df.columns:
-                        st.error(f"Missing column: {col}")
-                        df = pd.DataFrame(columns=required_cols)
-                        break
-                else:
-                    # Sort and format
-                    df["DateTime (UTC)"] = pd.to_datetime(df["DateTime (UTC)"], utc=True)
-                    df = df.sort_values("DateTime (UTC)").reset_index(drop=True)
-                    
-                    # Format display
-                    df["DateTime (UTC)"] = df["DateTime (UTC)"].dt.strftime('%Y-%m-%d %H:%M:%S')
-                    df["Angle"] = df["Angle"].apply(lambda x: f"{x:.1f}")
-                    df["Δ (deg)"] = df["Δ (deg)"].apply(lambda x: f"{x:.3f}")
+            chunks = scan_chunks(start_dt, end_dt, step_minutes)
+            scan_args = (cfg.planet1, cfg.planet2, target_angles, orb)
+            if SCAN_WORKERS > 1 and len(chunks) > 1:
+                # Multi-chunk scans spread their cache misses over worker processes
+                results = scan_chunks_parallel(*scan_args, chunks, step_minutes)
             else:
-                df = pd.DataFrame(columns=["DateTime (UTC)", "Planet 1", "Planet 2", "Angle", "Δ (deg)"])
-        
+                results = (_cached_scan(*scan_args, chunk_start.isoformat(), chunk_end.isoformat(), step_minutes)
+                           for chunk_start, chunk_end in chunks)
+            
+            frames = []
+            last_update = 0.0
+            for k, ((_, chunk_end), frame) in enumerate(zip(chunks, results), 1):
+                frames.append(frame)
+                # Each update is a websocket message; cache hits finish chunks in
+                # microseconds, so cap redraws at PROGRESS_INTERVAL_S
+                now = time.monotonic()
+                if now - last_update >= PROGRESS_INTERVAL_S:
+                    progress_bar.progress(k / len(chunks), text=f"Scanned to {chunk_end:%Y-%m-%d}")
+                    # Hits found so far, so long scans show results before they finish
+                    if len(frame) > 0:
+                        table.dataframe(merge_scan_chunks(frames), use_container_width=True,
+                                        height=400, column_config=RESULT_COLUMN_CONFIG)
+                    last_update = now
+            df = merge_scan_chunks(frames)
+            # Kept so later reruns with unchanged settings show these results again
+            st.session_state.last_results = (dict(vars(cfg)), note, df)
         except Exception as e:
-            st.error(f"Failed to build DataFrame: {str(e)}")
-            df = pd.DataFrame(columns=["DateTime (UTC)", "Planet 1", "Planet 2", "Angle", "Δ (deg)"])
-        
-        # Store in session state
-        st.session_state.harmonics_df = df
-        
-        # Display results section
-        st.markdown("---")
-        st.subheader("Harmonic Timing Results")
+            st.error(f"Scan failed: {str(e)}")
+            df = pd.DataFrame(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+            st.session_state.last_results = None
         
-        event_type = "recurrence event(s)" if st.session_state.mode == "Fingerprint" else "harmonic event(s)"
-        
-        if len(df) > 0:
-            st.success(f"Found {len(df)} {event_type}")
-        else:
-            st.info(f"Found 0 {event_type}")
-        
-        # Always display dataframe
-        st.dataframe(df, use_container_width=True, height=400)
-        
-        # CSV download button
-        csv = df.to_csv(index=False)
-        file_prefix = "fingerprint" if st.session_state.mode == "Fingerprint" else "harmonics"
-        st.download_button(
-            label="Download Results (CSV)",
-            data=csv,
-            file_name=f"luminara_{file_prefix}_{st.session_state.planet1}_{st.session_state.planet2}_{datetime.now(timezone.utc).strftime('%Y%m%d')}_utc.csv",
-            mime="text/csv"
-        )
+        show_results(df, cfg, status, table)
+    
+    elif last_results is not None and last_results[0] == vars(cfg):
+        # A rerun from another widget (or the download button) with the settings unchanged
+        _, note, df = last_results
+        if note:
+            st.info(note)
+        status, table = results_section()
+        show_results(df, cfg, status, table)
     
     else:
         # Instructions when no scan is running
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">Welcome to Luminara</div>', unsafe_allow_html=True)
-        st.markdown("""
-        Configure your scan in the sidebar and click **Run Harmonic Scan** to begin.
-        
-        **Two Modes Available:**
-        
-        **Harmonics Mode:**
-        - Scan for predefined harmonic angles (0°, 45°, 60°, 90°, etc.)
-        - Select multiple angles to detect simultaneously
-        - Classic astrological aspects and divisions
-        
-        **Fingerprint Mode:**
-        - Capture the exact planetary angle at a specific moment (anchor datetime)
-        - Scan forward to find when that exact angle recurs
-        - Perfect for identifying cyclical patterns and timing repetitions
-        
-        **Technical Features:**
-        - High-precision planetary ephemeris (JPL DE421)
-        - Geocentric ecliptic longitudes (tropical)
-        - Golden-section refinement for second-level accuracy
-        - Bracket-and-refine algorithm eliminates grid snapping
-        - Custom orb tolerance and scan step size
-        
-        **How It Works:**
-        1. Coarse scan divides time range into brackets (step size)
-        2. Each bracket is checked for proximity to target angles
-        3. Promising brackets are refined using golden-section search
-        4. Only hits within orb tolerance are recorded
-        5. Results show exact time with second precision
-        
-        **Coming Soon:**
-        - Asset price anchoring
-        - Square of 9 projection ladders
-        - Historical backlog database
-        - Alert system with notifications
-        """)
-        st.markdown('</div>', unsafe_allow_html=True)
+        # One element for the whole card: each st.markdown call is rendered on its own, so
+        # a <div> opened in one call cannot wrap content from the next. The blank lines
+        # let the body inside the <div> still render as Markdown
+        st.markdown(
+            f'<div class="card"><div class="card-title">Welcome to Luminara</div>\n\n{WELCOME_MD}\n\n</div>',
+            unsafe_allow_html=True
+        )
 
 # ============================================================================
 # RUN APPLICATION
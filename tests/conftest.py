@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from skyfield.api import load
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from luminara_scan import resolve_bodies
+
+
+@pytest.fixture(scope='session')
+def ephemeris():
+    """
+    (bodies, ts) for DE421. The app and its worker processes load de421.bsp from the
+    working directory, so the tests run from LUMINARA_DATA_DIR (default: the repo root),
+    where Skyfield downloads the file if it is missing.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(os.environ.get('LUMINARA_DATA_DIR', ROOT))
+        yield resolve_bodies(load('de421.bsp')), load.timescale()
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from luminara_scan import CoarseSampleStore
+
+
+def samples(n):
+    return np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float32)
+
+
+def test_disk_copy_outlives_the_store(tmp_path):
+    CoarseSampleStore(4, str(tmp_path), 10**6).put(('Sun', 'Moon', 'a', 'b', 60), samples(10))
+    
+    tt, separation = CoarseSampleStore(4, str(tmp_path), 10**6).get(('Sun', 'Moon', 'a', 'b', 60))
+    np.testing.assert_array_equal(tt, samples(10)[0])
+    assert separation.dtype == np.float32
+    assert CoarseSampleStore(4, str(tmp_path), 10**6).get(('Sun', 'Moon', 'a', 'b', 30)) is None
+
+
+def test_disk_is_pruned_least_recently_used_first(tmp_path):
+    keys = [('Sun', 'Moon', str(k), '', 60) for k in range(4)]
+    store = CoarseSampleStore(1, str(tmp_path), 10**6)
+    store.put(keys[0], samples(1000))
+    entry_bytes = sum(f.stat().st_size for f in tmp_path.iterdir())
+    
+    # Room for three files; key 0 is the oldest write but is read back after key 1
+    store = CoarseSampleStore(1, str(tmp_path), int(3.5 * entry_bytes))
+    store.put(keys[1], samples(1000))
+    os.utime(store._path(keys[0]), (0, 0))
+    os.utime(store._path(keys[1]), (1, 1))
+    assert store.get(keys[0]) is not None
+    store.put(keys[2], samples(1000))
+    store.put(keys[3], samples(1000))
+    
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 3.5 * entry_bytes
+    fresh = CoarseSampleStore(1, str(tmp_path), 0)
+    assert fresh.get(keys[1]) is None
+    assert all(fresh.get(key) is not None for key in (keys[0], keys[3]))
+
+
+def test_unwritable_directory_keeps_memory_cache(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    store = CoarseSampleStore(4, str(blocker / 'coarse'), 10**6)
+    store.put(('Sun', 'Moon', 'a', 'b', 60), samples(10))
+    assert store.get(('Sun', 'Moon', 'a', 'b', 60)) is not None
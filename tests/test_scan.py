@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from luminara_scan import (
+    COARSE_TOLERANCE_DEG, PlanetScanner, angular_distance_deg, detect_hits, merge_scan_chunks,
+    scan_chunks, scan_harmonic_timing_refined, utc_timestamps
+)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# (planet1, planet2, angles, orb, start, end, step minutes, brute-force step minutes)
+CASES = [
+    ('Sun', 'Moon', [0, 90, 180, 270], 1.0, utc(2025, 1, 1), utc(2025, 3, 1), 60, 1),
+    # The Moon moves several times the orb between samples
+    ('Moon', 'Venus', [0, 45, 90, 135, 180, 270], 0.2, utc(2025, 1, 1), utc(2025, 3, 1), 120, 1),
+    # Holds a near-miss: Mercury turns 1.84° short of 340° on 2025-03-08
+    ('Sun', 'Mercury', [20, 340], 3.0, utc(2025, 1, 1), utc(2025, 4, 1), 240, 5),
+    ('Mars', 'Venus', [0, 60, 120, 180], 2.0, utc(2025, 1, 1), utc(2025, 12, 31), 60, 10),
+    # Slow pairs at a daily step, where the coarse error spans many samples
+    ('Jupiter', 'Saturn', [0, 60, 90, 120, 180], 1.0, utc(1990, 1, 1), utc(2030, 1, 1), 1440, 120),
+    ('Uranus', 'Neptune', [0, 30, 45, 60], 1.0, utc(1950, 1, 1), utc(2050, 1, 1), 1440, 720),
+    # The coarse separation reaches 360 here, next to a conjunction
+    ('Sun', 'Uranus', [0, 90, 180, 360], 1.0, utc(1944, 5, 25), utc(1944, 6, 5), 60, 1),
+]
+
+
+def brute_force_hits(bodies, ts, planet1, planet2, angles, orb, start, end, step_minutes):
+    """Interior local minima within orb of the exact distance to each angle, on a dense grid."""
+    scanner = PlanetScanner(bodies, ts, planet1, planet2)
+    tts = np.arange(ts.from_datetime(start).tt, ts.from_datetime(end).tt, step_minutes / 1440.0)
+    separation = scanner.separations_at(tts)
+    hits = []
+    for angle in angles:
+        d = angular_distance_deg(separation, angle)
+        i = 1 + np.flatnonzero((d[1:-1] <= d[:-2]) & (d[1:-1] < d[2:]) & (d[1:-1] <= orb))
+        hits += zip(utc_timestamps(ts.tt_jd(tts[i])), [angle] * len(i), d[i])
+    return hits
+
+
+def assert_matches_brute_force(df, brute, orb, step_minutes):
+    # Minima within the brute-force grid's error of the orb may fall either side of it
+    scan = [hit for hit in zip(df["DateTime (UTC)"], df["Angle"], df["Δ (deg)"])
+            if abs(hit[2] - orb) > 0.01]
+    brute = [hit for hit in brute if abs(hit[2] - orb) > 0.01]
+    assert len(scan) == len(brute)
+    
+    for time, angle, delta in brute:
+        match = [hit for hit in scan
+                 if hit[1] % 360 == angle % 360 and abs(hit[0] - time) < pd.Timedelta(days=1)]
+        assert len(match) == 1, (time, angle)
+        time_scan, _, delta_scan = match[0]
+        # Refinement lands at least as close as the best grid sample
+        assert delta_scan <= delta + 1e-5, (time, angle)
+        if delta_scan < 1e-3:
+            # A crossing; a near-miss minimum is too flat to time against the grid
+            assert abs(time_scan - time) <= pd.Timedelta(minutes=step_minutes), (time, angle)
+
+
+@pytest.mark.parametrize('case', CASES, ids=lambda case: f'{case[0]}-{case[1]}')
+def test_scan_matches_brute_force(ephemeris, case):
+    bodies, ts = ephemeris
+    planet1, planet2, angles, orb, start, end, step, brute_step = case
+    df = scan_harmonic_timing_refined(bodies, ts, planet1, planet2, angles, orb, start, end, step)
+    if 360 in angles:
+        # 0 and 360 are the same aspect; the scan keeps one hit per event
+        angles = [angle for angle in angles if angle != 360]
+    brute = brute_force_hits(bodies, ts, planet1, planet2, angles, orb, start, end, brute_step)
+    assert len(brute) > 0
+    assert_matches_brute_force(df, brute, orb, brute_step)
+
+
+@pytest.mark.parametrize('chunk_steps', [24, 97, 1000])
+@pytest.mark.parametrize('case', CASES[:-1], ids=lambda case: f'{case[0]}-{case[1]}')
+def test_chunked_scan_matches_single_scan(ephemeris, case, chunk_steps):
+    bodies, ts = ephemeris
+    planet1, planet2, angles, orb, start, end, step, _ = case
+    scan_args = (bodies, ts, planet1, planet2, angles, orb)
+    full = scan_harmonic_timing_refined(*scan_args, start, end, step)
+    merged = merge_scan_chunks([scan_harmonic_timing_refined(*scan_args, chunk_start, chunk_end, step)
+                                for chunk_start, chunk_end in scan_chunks(start, end, step, chunk_steps)])
+    
+    assert len(merged) == len(full)
+    assert (merged["DateTime (UTC)"] - full["DateTime (UTC)"]).abs().max() < pd.Timedelta(seconds=2)
+    pd.testing.assert_series_equal(merged["Angle"], full["Angle"])
+
+
+def test_chunk_boundary_on_a_hit(ephemeris):
+    bodies, ts = ephemeris
+    scan_args = (bodies, ts, 'Sun', 'Moon', [0, 90, 180, 270], 1.0)
+    full = scan_harmonic_timing_refined(*scan_args, utc(2025, 1, 1), utc(2025, 3, 1), 60)
+    
+    # Split at each hit's own minute: the hit lies in both chunks or at the edge of one
+    for hit in full["DateTime (UTC)"]:
+        boundary = hit.floor('min').to_pydatetime()
+        merged = merge_scan_chunks([
+            scan_harmonic_timing_refined(*scan_args, utc(2025, 1, 1), boundary, 60),
+            scan_harmonic_timing_refined(*scan_args, boundary, utc(2025, 3, 1), 60),
+        ])
+        assert len(merged) == len(full), hit
+        assert (merged["DateTime (UTC)"] - full["DateTime (UTC)"]).abs().max() < pd.Timedelta(seconds=2)
+
+
+def test_detect_hits_separation_of_360():
+    separation = np.array([359.5, 359.9, 360.0, 0.3, 0.8], dtype=np.float32)
+    targets = np.array([0, 90, 180], dtype=np.float32)
+    assert detect_hits(separation, targets, 1.0, COARSE_TOLERANCE_DEG) == [(1, 2, 3, 0)]
+
+
+def test_detect_hits_targets_0_and_360():
+    separation = np.array([355.0, 358.0, 0.5, 3.0, 6.0, 90.0, 180.0], dtype=np.float32)
+    targets = np.array([0, 360], dtype=np.float32)
+    assert detect_hits(separation, targets, 1.0) == [(1, 2, 3, 0), (1, 2, 3, 1)]
+
+
+def test_target_360_finds_conjunctions(ephemeris):
+    bodies, ts = ephemeris
+    scan_args = (bodies, ts, 'Sun', 'Moon')
+    span = (1.0, utc(2025, 1, 1), utc(2025, 3, 1), 60)
+    at_0 = scan_harmonic_timing_refined(*scan_args, [0], *span)
+    at_360 = scan_harmonic_timing_refined(*scan_args, [360], *span)
+    
+    assert len(at_0) == 2
+    pd.testing.assert_series_equal(at_360["DateTime (UTC)"], at_0["DateTime (UTC)"])
+    assert (at_360["Angle"] == 360).all()
+
+
+def test_near_miss_is_refined_to_its_minimum(ephemeris):
+    bodies, ts = ephemeris
+    df = scan_harmonic_timing_refined(bodies, ts, 'Sun', 'Mercury', [340], 3.0,
+                                      utc(2025, 2, 20), utc(2025, 3, 20), 240)
+    
+    assert len(df) == 1
+    assert abs(df["DateTime (UTC)"][0] - pd.Timestamp('2025-03-08 01:41:33', tz='UTC')) < pd.Timedelta(minutes=30)
+    assert df["Δ (deg)"][0] == pytest.approx(1.8438, abs=1e-3)
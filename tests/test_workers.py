@@ -0,0 +1,37 @@
+import sys
+import types
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from conftest import ROOT
+from luminara_scan import scan_harmonic_timing_refined
+
+APP = ROOT / 'streamlit_app.py'
+
+
+def script_run(monkeypatch):
+    """Execute the app the way Streamlit does: in a fresh module installed as __main__."""
+    module = types.ModuleType('__main__')
+    module.__file__ = str(APP)
+    monkeypatch.setitem(sys.modules, '__main__', module)
+    exec(compile(APP.read_text(encoding='utf-8'), str(APP), 'exec'), module.__dict__)
+    return module
+
+
+def test_worker_pool_survives_a_newer_script_run(ephemeris, monkeypatch):
+    bodies, ts = ephemeris
+    job = ('Sun', 'Moon', [0.0, 90.0, 180.0], 1.0, datetime(2025, 1, 1, tzinfo=timezone.utc),
+           datetime(2025, 2, 1, tzinfo=timezone.utc), 60, None)
+    
+    # A second session's run replaces __main__ while the first run's scan is dispatching
+    first = script_run(monkeypatch)
+    script_run(monkeypatch)
+    
+    with first.scan_worker_pool(2) as pool:
+        frames = [frame for frame, _ in pool.map(first._scan_chunk_worker, [job, job])]
+    
+    expected = scan_harmonic_timing_refined(bodies, ts, *job[:-1])
+    assert len(expected) > 0
+    for frame in frames:
+        pd.testing.assert_frame_equal(frame, expected)